@@ -1,4 +1,5 @@
 import asyncio
+import logging
 import threading
 import sys
 import os
@@ -14,8 +15,8 @@ if src_path not in sys.path:
 try:
     from bongchun_agent.app_config import load_config
     from bongchun_agent.utils import run_async_loop
-    from PyQt6.QtWidgets import QApplication
-    from bongchun_agent.gui import BongchunAgentGUI  # 클래스 이름 변경
+    from PyQt6.QtWidgets import QApplication, QMessageBox
+    from bongchun_agent.gui import BongchunAgentGUI, apply_global_style
     from bongchun_agent.app_controller import AppController
     from bongchun_agent.prompt_manager import PromptManager
     from bongchun_agent.hotkey_manager import HotkeyManager
@@ -33,6 +34,15 @@ except Exception as e:
     sys.exit(1)
 
 
+def report_prompt_error(title, message):
+    """PromptManager 오류를 대화상자로 표시 (GUI 스레드가 아니면 콘솔에 출력)"""
+    # 추가 프롬프트는 비동기 루프 스레드에서 읽히므로, 그곳에서 QMessageBox를 띄우지 않도록 구분
+    if threading.current_thread() is threading.main_thread():
+        QMessageBox.critical(None, title, message)
+    else:
+        print(f"{title}: {message}", file=sys.stderr)
+
+
 def main():
     """
     bongchun_agent 애플리케이션의 메인 진입점.
@@ -40,8 +50,12 @@ def main():
     """
     print("main.py 실행됨. bongchun_agent 애플리케이션 시작...")
 
+    # GUI 디버그 로그는 기본적으로 출력하지 않음 (필요 시 DEBUG로 변경)
+    logging.basicConfig(level=logging.WARNING)
+
     # 0. QApplication 인스턴스 생성
     app = QApplication(sys.argv)
+    apply_global_style(app)
     print("QApplication 인스턴스 생성됨.")
 
     # 1. 설정 로드
@@ -66,7 +80,7 @@ def main():
     print("비동기 이벤트 루프 시작됨.")
 
     # 3. 주요 컴포넌트 인스턴스화
-    prompt_manager = PromptManager()
+    prompt_manager = PromptManager(on_error=report_prompt_error)
     app_controller = AppController(
         loop=async_loop, config=config_data, prompt_manager=prompt_manager
     )
@@ -76,6 +90,7 @@ def main():
         prompt_manager=prompt_manager,
         hotkey_manager=app_controller.hotkey_manager,
         app_controller=app_controller,
+        max_chat_blocks=config_data.get("chat_max_blocks", 2000),
     )
 
     # 4. 컨트롤러에 GUI 참조 설정
@@ -5,6 +5,16 @@ import google.genai as genai
 from dotenv import load_dotenv
 
 NO_PROMPT_OPTION = ""
+WHISPER_COMPUTE_TYPES = (
+    "auto",
+    "int8",
+    "int8_float16",
+    "int8_float32",
+    "int8_bfloat16",
+    "float16",
+    "bfloat16",
+    "float32",
+)
 
 
 def load_config():
@@ -15,7 +25,8 @@ def load_config():
         dict: 로드된 설정 값들을 담은 딕셔너리. 오류 발생 시 None 반환.
               딕셔너리 키: 'google_api_key', 'model_name', 'safety_settings',
                         'generation_config', 'mcp_servers', 'whisper_model_name',
-                        'whisper_device_pref', 'stt_provider', 'google_credentials'
+                        'whisper_device_pref', 'whisper_compute_type', 'stt_provider',
+                        'google_credentials', 'chat_max_blocks'
     """
     config = {}
     try:
@@ -141,6 +152,15 @@ def load_config():
             print(f"환경 변수 'WHISPER_DEVICE' 설정: '{whisper_device_pref}'")
         config["whisper_device_pref"] = whisper_device_pref
 
+        # Whisper Compute Type ('auto'이면 장치에 맞춰 선택)
+        whisper_compute_type = (os.getenv("WHISPER_COMPUTE_TYPE") or "auto").lower()
+        if whisper_compute_type not in WHISPER_COMPUTE_TYPES:
+            print(
+                f"경고: WHISPER_COMPUTE_TYPE 환경 변수 값 '{whisper_compute_type}'이(가) 유효하지 않습니다. 'auto' 설정을 사용합니다."
+            )
+            whisper_compute_type = "auto"
+        config["whisper_compute_type"] = whisper_compute_type
+
         # STT Provider
         stt_provider = os.getenv("STT_PROVIDER", "whisper").lower()
         if stt_provider not in ["whisper", "google"]:
@@ -170,6 +190,19 @@ def load_config():
                 print(f"Google Cloud 인증 파일 경로: '{google_credentials}'")
         config["google_credentials"] = google_credentials
 
+        # Chat Display Block Limit (0이면 제한 없음)
+        chat_max_blocks_str = os.getenv("CHAT_MAX_BLOCKS") or "2000"
+        try:
+            chat_max_blocks = int(chat_max_blocks_str)
+            if chat_max_blocks < 0:
+                raise ValueError
+        except ValueError:
+            print(
+                f"경고: CHAT_MAX_BLOCKS 환경 변수 값 '{chat_max_blocks_str}'이(가) 유효하지 않습니다. 기본값 2000을 사용합니다."
+            )
+            chat_max_blocks = 2000
+        config["chat_max_blocks"] = chat_max_blocks
+
         return config
 
     except (ValueError, FileNotFoundError) as e:
@@ -1,11 +1,14 @@
 import asyncio
 import traceback
-import queue
+import collections
 import threading
 from typing import Optional
 import os
 
+from PyQt6.QtCore import QObject, pyqtSignal
+
 from .client import MultiMCPClient
+from .messages import MessageKind
 from .prompt_manager import PromptManager
 from .stt_service import STTService
 from .hotkey_manager import HotkeyManager
@@ -16,19 +19,29 @@ if TYPE_CHECKING:
     from .gui import ChatGUI
 
 
-class AppController:
+class AppController(QObject):
+    # 응답 큐에 메시지가 추가되었음을 GUI에 알림 (워커 스레드에서 발생 가능)
+    response_ready = pyqtSignal()
+    # 첨부 목록이 바뀔 때마다 [(경로, 파일명), ...] 전체를 GUI에 전달
+    attachments_changed = pyqtSignal(list)
+
     def __init__(
         self,
         loop: asyncio.AbstractEventLoop,
         config: dict,
         prompt_manager: PromptManager,
     ):
+        super().__init__()
         self.gui: Optional["ChatGUI"] = None
         self.loop = loop
         self.config = config
         self.prompt_manager = prompt_manager
-        self.response_queue = queue.Queue()
+        # GUI로 보낼 (종류, 내용) 메시지. append/popleft는 GIL 하에서 원자적이므로 별도 잠금 없이
+        # 워커 스레드가 추가하고 GUI 스레드가 꺼내 씀
+        self.response_queue: collections.deque = collections.deque()
         self.attached_files: list[str] = []
+        # 중복 확인용 (순서는 attached_files 리스트가 유지)
+        self._attached_set: set[str] = set()
         self.model_name = self.config.get("model_name")
         self.safety_settings = self.config.get("safety_settings")
         self.generation_config = self.config.get("generation_config")
@@ -55,12 +68,14 @@ class AppController:
         print("AppController: GUI 참조 설정 완료.")
         if self.mcp_client and self.mcp_client.sessions:
             tool_names = [t.name for t in self.mcp_client.all_mcp_tools]
-            self.response_queue.put(
-                f"System: MCP 서버 연결됨. 사용 가능 도구: {len(tool_names)}개"
+            self._post(
+                MessageKind.STATUS,
+                f"MCP 서버 연결됨. 사용 가능 도구: {len(tool_names)}개",
             )
         elif self.mcp_client and not self.mcp_client.sessions:
-            self.response_queue.put(
-                "System: 경고: 연결된 MCP 서버가 없습니다. 도구 사용이 제한됩니다."
+            self._post(
+                MessageKind.STATUS,
+                "경고: 연결된 MCP 서버가 없습니다. 도구 사용이 제한됩니다.",
             )
 
         if self.hotkey_manager:
@@ -74,17 +89,24 @@ class AppController:
                 print(
                     "AppController 경고: pynput 키보드 리스너를 사용할 수 없습니다. 단축키 비활성화됨."
                 )
-                self.response_queue.put(
-                    "System: 경고: 키보드 입력 감지 불가. 단축키 비활성화됨."
+                self._post(
+                    MessageKind.STATUS,
+                    "경고: 키보드 입력 감지 불가. 단축키 비활성화됨.",
                 )
         print("AppController: set_gui() 메서드 종료.")
 
+    def _post(self, kind: MessageKind, payload: str = ""):
+        """응답 큐에 (종류, 내용) 메시지를 넣고 GUI에 처리 시그널을 보냅니다."""
+        self.response_queue.append((kind, payload))
+        self.response_ready.emit()
+
     def _initialize_services(self):
         """MCP 클라이언트, STT 서비스, HotkeyManager 초기화"""
         try:
             stt_provider = self.config.get("stt_provider")
             whisper_model = self.config.get("whisper_model_name")
             whisper_device = self.config.get("whisper_device_pref")
+            whisper_compute_type = self.config.get("whisper_compute_type", "auto")
             try:
                 print(
                     f"AppController: STT 서비스 초기화 시도 (제공자: {stt_provider})..."
@@ -93,6 +115,7 @@ class AppController:
                     provider=stt_provider,
                     whisper_model_name=whisper_model,
                     whisper_device_preference=whisper_device,
+                    whisper_compute_type=whisper_compute_type,
                 )
                 print(f"AppController: STT 서비스 ({stt_provider}) 초기화 완료.")
             except NameError:
@@ -124,9 +147,7 @@ class AppController:
                 print(f"AppController 경고: HotkeyManager 초기화 실패 ({e}).")
                 traceback.print_exc()
                 self.hotkey_manager = None
-                self.response_queue.put(
-                    f"System: 경고: 단축키 관리자 초기화 실패 - {e}"
-                )
+                self._post(MessageKind.STATUS, f"경고: 단축키 관리자 초기화 실패 - {e}")
 
             model_name = self.config.get("model_name")
             safety_settings = self.config.get("safety_settings")
@@ -151,7 +172,7 @@ class AppController:
         except Exception as e:
             print(f"AppController: 서비스 초기화 중 심각한 오류: {e}")
             traceback.print_exc()
-            self.response_queue.put(f"System: 치명적 오류: 서비스 초기화 실패 - {e}")
+            self._post(MessageKind.STATUS, f"치명적 오류: 서비스 초기화 실패 - {e}")
 
     async def _connect_mcp_servers(self):
         """비동기 MCP 서버 연결"""
@@ -162,20 +183,22 @@ class AppController:
             await self.mcp_client.connect_all_servers(self.mcp_servers)
             if not self.mcp_client.sessions:
                 print("AppController 경고: 연결된 MCP 서버가 없습니다.")
-                self.response_queue.put(
-                    "System: 경고: 연결된 MCP 서버가 없습니다. 도구 사용이 제한됩니다."
+                self._post(
+                    MessageKind.STATUS,
+                    "경고: 연결된 MCP 서버가 없습니다. 도구 사용이 제한됩니다.",
                 )
             else:
                 tool_names = [t.name for t in self.mcp_client.all_mcp_tools]
                 print(
                     f"AppController: 사용 가능한 MCP 도구 ({len(tool_names)}개): {tool_names}"
                 )
-                self.response_queue.put(
-                    f"System: MCP 서버 연결됨. 사용 가능 도구: {len(tool_names)}개"
+                self._post(
+                    MessageKind.STATUS,
+                    f"MCP 서버 연결됨. 사용 가능 도구: {len(tool_names)}개",
                 )
         except Exception as e:
             print(f"AppController: MCP 서버 연결 오류: {e}")
-            self.response_queue.put(f"System: 오류: MCP 서버 연결 실패 - {e}")
+            self._post(MessageKind.STATUS, f"오류: MCP 서버 연결 실패 - {e}")
             traceback.print_exc()
 
     async def _process_ai_query(
@@ -186,14 +209,14 @@ class AppController:
     ):
         """비동기로 AI 쿼리 처리"""
         if not self.mcp_client:
-            self.response_queue.put(
-                "System: 오류: MCP 클라이언트가 준비되지 않았습니다."
+            self._post(
+                MessageKind.STATUS, "오류: MCP 클라이언트가 준비되지 않았습니다."
             )
-            self.response_queue.put("System: Buttons enabled")
+            self._post(MessageKind.BUTTONS_ENABLED)
             return
 
         try:
-            self.response_queue.put("System: AI 처리 중...")
+            self._post(MessageKind.PROCESSING)
 
             # 1. 첫 요청인지 확인하고 default 프롬프트 추가
             system_prefix = ""
@@ -242,23 +265,22 @@ class AppController:
                 f"[DEBUG] Raw AI response received from client:\n---\n{ai_response}\n---"
             )
 
-            self.response_queue.put(f"AI\n{ai_response}")
+            self._post(MessageKind.AI, ai_response)
 
         except Exception as e:
-            self.response_queue.put(f"System: AI 처리 중 오류 발생: {e}")
+            self._post(MessageKind.STATUS, f"AI 처리 중 오류 발생: {e}")
             traceback.print_exc()
         finally:
-            self.attached_files.clear()
-            self.response_queue.put("System: Clear attachment label")
-            self.response_queue.put("System: Buttons enabled")
+            self._clear_attachments()
+            self._post(MessageKind.BUTTONS_ENABLED)
 
     def _run_stt_in_thread(self, additional_prompt: Optional[str]):
         """STT 작업을 별도 스레드에서 실행"""
         user_input = None
         try:
             if not self.stt_service:
-                self.response_queue.put(
-                    "System: 오류: STT 서비스가 준비되지 않았습니다."
+                self._post(
+                    MessageKind.STATUS, "오류: STT 서비스가 준비되지 않았습니다."
                 )
                 return
 
@@ -266,7 +288,7 @@ class AppController:
             if audio_data is not None and audio_data.size > 0:
                 user_input = self.stt_service.transcribe_audio(audio_data)
                 if user_input:
-                    self.response_queue.put(f"User\n{user_input}")
+                    self._post(MessageKind.USER, user_input)
 
                     current_file_paths = list(self.attached_files)
 
@@ -279,22 +301,22 @@ class AppController:
                         self.loop,
                     )
                 else:
-                    self.response_queue.put("System: 음성을 인식하지 못했습니다.")
+                    self._post(MessageKind.STATUS, "음성을 인식하지 못했습니다.")
             else:
-                self.response_queue.put("System: 오디오 녹음 실패 또는 취소됨.")
+                self._post(MessageKind.STATUS, "오디오 녹음 실패 또는 취소됨.")
         except Exception as e:
-            self.response_queue.put(f"System: 음성 입력 중 오류: {e}")
+            self._post(MessageKind.STATUS, f"음성 입력 중 오류: {e}")
             traceback.print_exc()
         finally:
             if not user_input:
-                self.response_queue.put("System: Buttons enabled")
-            self.response_queue.put("System: Hide recording status")
+                self._post(MessageKind.BUTTONS_ENABLED)
+            self._post(MessageKind.HIDE_RECORDING)
 
     def _start_new_chat(self) -> bool:
         """새로운 채팅 세션을 시작합니다."""
         if not self.mcp_client:
             print("AppController 오류: 새 채팅 시작 실패 - MCP 클라이언트 없음")
-            self.response_queue.put("System: 오류: 새 채팅 시작 실패 - 클라이언트 없음")
+            self._post(MessageKind.STATUS, "오류: 새 채팅 시작 실패 - 클라이언트 없음")
             return False
 
         try:
@@ -306,7 +328,7 @@ class AppController:
                     "AppController 경고: MCP Client에 'start_new_chat' 메서드가 없습니다."
                 )
 
-            self.attached_files.clear()
+            self._clear_attachments()
             self.is_first_request = True
             print("AppController: 새로운 채팅 세션 시작됨 (첫 요청 플래그 리셋).")
             return True
@@ -314,19 +336,19 @@ class AppController:
             error_msg = f"새로운 채팅 세션을 시작하는 데 실패했습니다: {e}"
             print(f"AppController 오류: {error_msg}")
             traceback.print_exc()
-            self.response_queue.put(f"System: 오류: {error_msg}")
+            self._post(MessageKind.STATUS, f"오류: {error_msg}")
             return False
 
     def process_user_request(self, user_request: str, additional_prompt: Optional[str]):
         """사용자 텍스트 요청 처리"""
         if not self.mcp_client:
-            self.response_queue.put(
-                "System: 오류: MCP 클라이언트가 준비되지 않았습니다."
+            self._post(
+                MessageKind.STATUS, "오류: MCP 클라이언트가 준비되지 않았습니다."
             )
-            self.response_queue.put("System: Buttons enabled")
+            self._post(MessageKind.BUTTONS_ENABLED)
             return
 
-        self.response_queue.put(f"User\n{user_request}")
+        self._post(MessageKind.USER, user_request)
 
         current_file_paths = list(self.attached_files)
 
@@ -342,11 +364,11 @@ class AppController:
     def handle_voice_input(self):
         """음성 입력 요청 처리"""
         if not self.stt_service:
-            self.response_queue.put("System: 오류: STT 서비스가 준비되지 않았습니다.")
+            self._post(MessageKind.STATUS, "오류: STT 서비스가 준비되지 않았습니다.")
             return
 
-        self.response_queue.put("System: Show recording status")
-        self.response_queue.put("System: Buttons disabled")
+        self._post(MessageKind.SHOW_RECORDING)
+        self._post(MessageKind.BUTTONS_DISABLED)
 
         additional_prompt_name = None
         if self.gui:
@@ -375,137 +397,26 @@ class AppController:
     def start_new_chat_session(self) -> bool:
         """새 채팅 세션 시작 요청 처리"""
         if self.gui:
-            self.response_queue.put("System: Clear chat display")
+            self._post(MessageKind.CLEAR_CHAT)
         return self._start_new_chat()
 
-    def attach_file(self, filepath: str):
-        """파일 첨부 요청 처리"""
-        if filepath not in self.attached_files:
-            self.attached_files.append(filepath)
-            filename = os.path.basename(filepath)
-            print(
-                f"AppController: 파일 첨부됨 - {filename} (총 {len(self.attached_files)}개)"
-            )
-            return True
-        else:
-            print(
-                f"AppController: 이미 첨부된 파일입니다 - {os.path.basename(filepath)}"
-            )
-            return False
-
-    def get_attachment_count(self) -> int:
-        """현재 첨부된 파일의 개수를 반환합니다."""
-        return len(self.attached_files)
-
-    def get_attachment_paths(self) -> list[str]:
-        """현재 첨부된 파일의 경로 리스트를 반환합니다."""
-        return list(self.attached_files)
-
-    def remove_attachment(self, filepath: str):
-        """첨부 파일 목록에서 특정 파일을 제거합니다."""
-        if filepath in self.attached_files:
-            self.attached_files.remove(filepath)
-            filename = os.path.basename(filepath)
-            print(
-                f"AppController: 파일 제거됨 - {filename} (남은 파일 {len(self.attached_files)}개)"
-            )
-            return True
-        else:
-            print(
-                f"AppController: 제거하려는 파일이 목록에 없습니다 - {os.path.basename(filepath)}"
-            )
-            return False
-
-    async def cleanup(self):
-        """애플리케이션 종료 시 리소스 정리"""
-        print("AppController: 정리 시작...")
-        if self.mcp_client:
-            print("AppController: MCP 클라이언트 정리 중...")
-            await self.mcp_client.cleanup()
-            print("AppController: MCP 클라이언트 정리 완료.")
-
-        if self.stt_service:
-            print("AppController: STT 서비스 정리 중...")
-            if hasattr(self.stt_service, "stop_recording") and callable(
-                getattr(self.stt_service, "stop_recording", None)
-            ):
-                try:
-                    self.stt_service.stop_recording()
-                except Exception as e:
-                    print(f"AppController 경고: STT 서비스 정리 중 오류: {e}")
-            print("AppController: STT 서비스 정리 완료.")
-
-        if self.hotkey_manager:
-            print("AppController: HotkeyManager 리스너 종료 중...")
-            self.hotkey_manager.stop_listener()
-            print("AppController: HotkeyManager 리스너 종료 완료.")
-
-        print("AppController: 정리 완료.")
-
-    def process_user_request(self, user_request: str, additional_prompt: Optional[str]):
-        """사용자 텍스트 요청 처리"""
-        if not self.mcp_client:
-            self.response_queue.put(
-                "System: 오류: MCP 클라이언트가 준비되지 않았습니다."
-            )
-            self.response_queue.put("System: Buttons enabled")
-            return
-
-        self.response_queue.put(f"User\n{user_request}")
-
-        current_file_paths = list(self.attached_files)
-
-        asyncio.run_coroutine_threadsafe(
-            self._process_ai_query(
-                user_request,
-                additional_prompt,
-                file_paths=current_file_paths,
-            ),
-            self.loop,
+    def _notify_attachments_changed(self):
+        """현재 첨부 목록을 (경로, 파일명) 튜플 리스트로 GUI에 알립니다."""
+        self.attachments_changed.emit(
+            [(path, os.path.basename(path)) for path in self.attached_files]
         )
 
-    def handle_voice_input(self):
-        """음성 입력 요청 처리"""
-        if not self.stt_service:
-            self.response_queue.put("System: 오류: STT 서비스가 준비되지 않았습니다.")
-            return
-
-        self.response_queue.put("System: Show recording status")
-        self.response_queue.put("System: Buttons disabled")
-
-        additional_prompt_name = None
-        if self.gui:
-            try:
-                additional_prompt_name = self.gui.prompt_dropdown.currentText()
-                print(
-                    f"[DEBUG] Selected prompt name from GUI: {additional_prompt_name}"
-                )
-            except AttributeError:
-                print(
-                    "AppController 경고: GUI에 prompt_dropdown이 없거나 currentText 메서드가 없습니다. 추가 프롬프트 이름 가져오기 실패."
-                )
-                additional_prompt_name = None
-        else:
-            print(
-                "AppController 경고: handle_voice_input 호출 시 GUI가 설정되지 않음. 추가 프롬프트 이름 사용 불가."
-            )
-            additional_prompt_name = None
-
-        threading.Thread(
-            target=self._run_stt_in_thread,
-            args=(additional_prompt_name,),
-            daemon=True,
-        ).start()
-
-    def start_new_chat_session(self) -> bool:
-        """새 채팅 세션 시작 요청 처리"""
-        if self.gui:
-            self.response_queue.put("System: Clear chat display")
-        return self._start_new_chat()
+    def _clear_attachments(self):
+        """첨부 목록을 비우고, 비어 있지 않았던 경우에만 변경을 알립니다."""
+        if self.attached_files:
+            self.attached_files.clear()
+            self._attached_set.clear()
+            self._notify_attachments_changed()
 
-    def attach_file(self, filepath: str):
-        """파일 첨부 요청 처리"""
-        if filepath not in self.attached_files:
+    def _add_attachment(self, filepath: str) -> bool:
+        """변경 알림 없이 첨부 목록에 파일을 추가합니다."""
+        if filepath not in self._attached_set:
+            self._attached_set.add(filepath)
             self.attached_files.append(filepath)
             filename = os.path.basename(filepath)
             print(
@@ -518,6 +429,20 @@ class AppController:
             )
             return False
 
+    def attach_file(self, filepath: str):
+        """파일 첨부 요청 처리"""
+        added = self._add_attachment(filepath)
+        if added:
+            self._notify_attachments_changed()
+        return added
+
+    def attach_files(self, filepaths: list[str]) -> int:
+        """여러 파일을 한 번에 첨부하고 변경 알림은 한 번만 보냅니다."""
+        added = sum(1 for filepath in filepaths if self._add_attachment(filepath))
+        if added:
+            self._notify_attachments_changed()
+        return added
+
     def get_attachment_count(self) -> int:
         """현재 첨부된 파일의 개수를 반환합니다."""
         return len(self.attached_files)
@@ -526,14 +451,20 @@ class AppController:
         """현재 첨부된 파일의 경로 리스트를 반환합니다."""
         return list(self.attached_files)
 
+    def has_attachments(self) -> bool:
+        """첨부된 파일이 하나 이상 있는지 여부를 반환합니다."""
+        return bool(self.attached_files)
+
     def remove_attachment(self, filepath: str):
         """첨부 파일 목록에서 특정 파일을 제거합니다."""
-        if filepath in self.attached_files:
+        if filepath in self._attached_set:
+            self._attached_set.discard(filepath)
             self.attached_files.remove(filepath)
             filename = os.path.basename(filepath)
             print(
                 f"AppController: 파일 제거됨 - {filename} (남은 파일 {len(self.attached_files)}개)"
             )
+            self._notify_attachments_changed()
             return True
         else:
             print(
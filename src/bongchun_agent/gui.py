@@ -1,6 +1,5 @@
-import os
-import traceback
-import queue
+import collections
+import logging
 from PyQt6.QtWidgets import (
     QApplication,
     QMainWindow,
@@ -16,7 +15,6 @@ from PyQt6.QtWidgets import (
     QListWidget,
     QListWidgetItem,
     QSizePolicy,
-    QSpacerItem,
 )
 from PyQt6.QtGui import (
     QTextCursor,
@@ -25,18 +23,52 @@ from PyQt6.QtGui import (
     QKeySequence,
     QTextBlockFormat,
     QTextCharFormat,
-    QColor,
     QFont,
+    QKeyEvent,
 )
 from PyQt6.QtCore import (
     Qt,
+    QEvent,
     pyqtSignal,
-    QThread,
-    QSize,
     QTimer,
-    QUrl,
+    QSignalBlocker,
+)
+
+from .app_config import NO_PROMPT_OPTION
+from .messages import MessageKind
+
+logger = logging.getLogger(__name__)
+
+# 한 번의 큐 처리에서 처리할 최대 메시지 수 (나머지는 다음 프레임으로 넘겨 이벤트 루프를 막지 않음)
+_MAX_MESSAGES_PER_DRAIN = 64
+# 응답 영역에 아무것도 그리지 않아 창이 보이지 않는 동안에도 바로 처리하는 메시지 종류.
+# 그 밖의 메시지(알 수 없는 종류 포함)는 순서가 바뀌지 않도록 창이 다시 보일 때까지 미룸
+_IMMEDIATE_WHILE_HIDDEN = frozenset(
+    {
+        MessageKind.PROCESSING,
+        MessageKind.BUTTONS_ENABLED,
+        MessageKind.BUTTONS_DISABLED,
+        MessageKind.CLEAR_CHAT,
+        MessageKind.HIDE_RECORDING,
+    }
 )
-from PyQt6.QtGui import QKeyEvent
+
+# 채팅 메시지 접두어 (슬라이스 길이는 미리 계산)
+_USER_PREFIX = "나:"
+_USER_PREFIX_LEN = len(_USER_PREFIX)
+_AGENT_PREFIX = "Agent:"
+_AGENT_PREFIX_LEN = len(_AGENT_PREFIX)
+_AI_DISPLAY_LABEL = "Gemini:\n"
+
+# 채팅 화면 색상 (메시지마다 QColor 문자열을 다시 해석하지 않도록 한 번만 생성)
+PALETTE = {
+    "default": QColor("#E0E0E0"),
+    "muted": QColor("#AAAAAA"),
+    "warn": QColor("orange"),
+    "err": QColor("red"),
+    "unknown": QColor("gray"),
+    "user": QColor("#FFFFFF"),
+}
 
 
 class ChatInputLineEdit(QLineEdit):
@@ -46,39 +78,27 @@ class ChatInputLineEdit(QLineEdit):
 
     def __init__(self, parent=None):
         super().__init__(parent)
-        print("[DEBUG] ChatInputLineEdit initialized")
+        logger.debug("ChatInputLineEdit initialized")
 
     def keyPressEvent(self, event: QKeyEvent):
         """키 입력 이벤트 처리 (붙여넣기 감지)"""
-        if event.matches(QKeySequence.StandardKey.Paste):
-            print("[DEBUG] Paste event detected in ChatInputLineEdit")
-            clipboard = QApplication.clipboard()
-            mime_data = clipboard.mimeData()
-
-            if mime_data.hasUrls():
-                print("[DEBUG] Clipboard has URLs (potential files)")
-                file_paths = []
-                for url in mime_data.urls():
-                    if url.isLocalFile():
-                        file_paths.append(url.toLocalFile())
-                if file_paths:
-                    print(
-                        f"[DEBUG] Emitting file_pasted signal with paths: {file_paths}"
-                    )
-                    self.file_pasted.emit(file_paths)
-                    event.accept()
-                    return
-                else:
-                    print(
-                        "[DEBUG] URLs are not local files, proceeding with default paste."
-                    )
-            else:
-                print(
-                    "[DEBUG] Clipboard does not contain URLs, proceeding with default paste."
-                )
-            super().keyPressEvent(event)
-        else:
-            super().keyPressEvent(event)
+        if not event.matches(QKeySequence.StandardKey.Paste):
+            return super().keyPressEvent(event)
+
+        # 대부분의 붙여넣기는 텍스트이므로 URL이 없으면 바로 기본 처리
+        mime_data = QApplication.clipboard().mimeData()
+        if not mime_data.hasUrls():
+            return super().keyPressEvent(event)
+
+        # toLocalFile()은 로컬 파일 URL에 대해서만 호출
+        file_paths = [
+            url.toLocalFile() for url in mime_data.urls() if url.isLocalFile()
+        ]
+        if file_paths:
+            self.file_pasted.emit(file_paths)
+            event.accept()
+            return
+        super().keyPressEvent(event)
 
 
 STYLESHEET = """
@@ -135,8 +155,8 @@ QPushButton:pressed {
     background-color: #444444; /* 클릭 시 배경 */
 }
 
-/* 아이콘 버튼 스타일 (전송, 음성) */
-QPushButton#sendButton, QPushButton#sttButton {
+/* 아이콘 버튼 스타일 (첨부, 전송, 음성) */
+QPushButton[role="iconBtn"] {
     background-color: #4A4A4A;
     border: 1px solid #666666;
     border-radius: 18px; /* 원형에 가까운 둥근 모서리 */
@@ -148,32 +168,11 @@ QPushButton#sendButton, QPushButton#sttButton {
     /* 아이콘 설정은 코드에서 진행 */
 }
 
-QPushButton#sendButton:hover, QPushButton#sttButton:hover {
-    background-color: #5A5A5A;
-}
-
-QPushButton#sendButton:pressed, QPushButton#sttButton:pressed {
-    background-color: #3A3A3A;
-}
-
-/* QPushButton (파일 첨부 버튼) */
-QPushButton#attachButton {
-    background-color: #4A4A4A;
-    border: 1px solid #666666;
-    border-radius: 18px; /* 원형에 가까운 둥근 모서리 */
-    min-width: 36px;
-    max-width: 36px;
-    min-height: 36px;
-    max-height: 36px;
-    padding: 0px;
-    font-size: 14pt; /* 아이콘 크기 조정 */
-}
-
-QPushButton#attachButton:hover {
+QPushButton[role="iconBtn"]:hover {
     background-color: #5A5A5A;
 }
 
-QPushButton#attachButton:pressed {
+QPushButton[role="iconBtn"]:pressed {
     background-color: #3A3A3A;
 }
 
@@ -253,35 +252,65 @@ QScrollBar::add-line:horizontal, QScrollBar::sub-line:horizontal {
 QScrollBar::add-page:horizontal, QScrollBar::sub-page:horizontal {
     background: none;
 }
-"""
+""".strip()
+
+
+def apply_global_style(app: QApplication):
+    """애플리케이션 전체에 스타일시트를 한 번만 적용 (창마다 QSS를 다시 파싱하지 않도록)"""
+    app.setStyleSheet(STYLESHEET)
 
 
 class BongchunAgentGUI(QMainWindow):
     """메인 GUI 창 클래스"""
 
-    def __init__(self, client, prompt_manager, hotkey_manager, app_controller):
+    def __init__(
+        self,
+        client,
+        prompt_manager,
+        hotkey_manager,
+        app_controller,
+        max_chat_blocks=2000,
+    ):
         super().__init__()
+        # 시그널 연결과 모든 요청 처리가 AppController에 의존하므로 생성 시 한 번만 확인
+        assert app_controller is not None, "BongchunAgentGUI requires an AppController"
         self.client = client
         self.prompt_manager = prompt_manager
         self.hotkey_manager = hotkey_manager
         self.app_controller = app_controller
-        self.attached_files = []
+        self._current_attachments = []
         self.processing_message_block = None
-        print("[DEBUG] BongchunAgentGUI initialized")
+        self._drain_scheduled = False
+        self._draining_queue = False
+        self._input_enabled = True
+        self.max_chat_blocks = max_chat_blocks
+        # 창이 숨겨진 동안 미뤄 둔 채팅 메시지 (화면 블록 수 제한보다 많이 보관해도 어차피 지워짐)
+        self._hidden_messages = collections.deque(maxlen=max_chat_blocks or None)
+        logger.debug("BongchunAgentGUI initialized")
 
         self.setWindowTitle("봉춘 로컬 에이전트")
         self.setGeometry(100, 100, 700, 800)
-        self.setStyleSheet(STYLESHEET)
 
         self._init_ui()
+        self._init_text_formats()
         self._connect_signals()
         self._setup_hotkeys()
 
-        # 응답 큐 처리를 위한 타이머 설정
-        self.queue_timer = QTimer(self)
-        self.queue_timer.timeout.connect(self._process_response_queue)
-        self.queue_timer.start(100)
-        print("[DEBUG] Response queue timer started.")
+        # 메시지 종류별 처리 함수 (문자열 비교 없이 dict 조회로 분기)
+        self._message_handlers = {
+            MessageKind.USER: lambda _: None,  # 전송 시 이미 표시됨
+            MessageKind.AI: self._show_ai_response,
+            MessageKind.STATUS: self._show_status_message,
+            MessageKind.PROCESSING: lambda _: None,  # 전송 시 이미 표시됨
+            MessageKind.BUTTONS_ENABLED: lambda _: self._enable_ui_elements(),
+            MessageKind.BUTTONS_DISABLED: lambda _: self._disable_ui_elements(),
+            MessageKind.CLEAR_CHAT: lambda _: self._clear_chat(),
+            MessageKind.SHOW_RECORDING: lambda _: self._show_recording_status(),
+            MessageKind.HIDE_RECORDING: lambda _: self._hide_recording_status(),
+        }
+
+        # GUI 생성 전에 쌓인 메시지 처리
+        self._schedule_queue_drain()
 
     def _init_ui(self):
         """UI 요소 초기화 및 배치"""
@@ -296,6 +325,12 @@ class BongchunAgentGUI(QMainWindow):
         self.responseArea = QTextEdit()
         self.responseArea.setObjectName("responseArea")
         self.responseArea.setReadOnly(True)
+        # 긴 세션에서 추가할 때마다 전체 문서를 다시 배치하지 않도록 오래된 블록부터 제거
+        self.responseArea.document().setMaximumBlockCount(self.max_chat_blocks)
+        # 읽기 전용 채팅 기록이므로 메시지마다 쌓이는 실행 취소 기록은 필요 없음
+        self.responseArea.setUndoRedoEnabled(False)
+        # 메시지마다 textCursor() 복사본을 만들지 않도록 추가용 커서를 한 번만 생성
+        self._response_cursor = self.responseArea.textCursor()
         self.responseArea.setSizePolicy(
             QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding
         )
@@ -318,64 +353,43 @@ class BongchunAgentGUI(QMainWindow):
         main_layout.addLayout(prompt_layout)
 
         # 프롬프트 목록 로드
-        try:
-            from .app_config import (
-                NO_PROMPT_OPTION,
-            )
-
-            available_prompts = self.prompt_manager.available_prompts
-            print(f"[DEBUG] Available prompts from attribute: {available_prompts}")
-            self.promptComboBox.addItems(available_prompts)
-            if NO_PROMPT_OPTION in available_prompts:
-                self.promptComboBox.setCurrentText(NO_PROMPT_OPTION)
-            elif available_prompts:
-                self.promptComboBox.setCurrentIndex(0)
-
-        except AttributeError:
-            print(
-                "[DEBUG] Error: prompt_manager does not have 'available_prompts' attribute or it's not ready."
+        available_prompts = getattr(self.prompt_manager, "available_prompts", None)
+        if available_prompts is None:
+            logger.warning(
+                "prompt_manager does not have 'available_prompts' attribute or it's not ready."
             )
-            traceback.print_exc()
             self.promptComboBox.addItem("오류: 프롬프트 속성 접근 불가")
             self.promptComboBox.setEnabled(False)
-        except Exception as e:
-            print(f"[DEBUG] Error loading prompts: {e}")
-            traceback.print_exc()
-            self.promptComboBox.addItem("오류: 프롬프트 로드 실패")
-            self.promptComboBox.setEnabled(False)
-
-        # --- 하단 입력 영역 ---
-        input_layout = QHBoxLayout()
-        input_layout.setSpacing(8)
+        else:
+            logger.debug("Available prompts from attribute: %s", available_prompts)
+            try:
+                self.promptComboBox.addItems(available_prompts)
+                if NO_PROMPT_OPTION in available_prompts:
+                    self.promptComboBox.setCurrentText(NO_PROMPT_OPTION)
+                elif available_prompts:
+                    self.promptComboBox.setCurrentIndex(0)
+            except Exception as e:
+                logger.exception("Error loading prompts: %s", e)
+                self.promptComboBox.addItem("오류: 프롬프트 로드 실패")
+                self.promptComboBox.setEnabled(False)
 
         # --- 첨부 파일 목록 (응답 영역 아래, 입력 영역 위) ---
-        self.attachmentListWidget = QListWidget()
-        self.attachmentListWidget.setObjectName("attachmentListWidget")
-        self.attachmentListWidget.setSizePolicy(
-            QSizePolicy.Policy.Expanding,
-            QSizePolicy.Policy.Fixed,
-        )
-        self.attachmentListWidget.setFixedHeight(40)
-        self.attachmentListWidget.setVisible(False)
-        # Flow layout 설정 (가로 스크롤)
-        self.attachmentListWidget.setFlow(QListWidget.Flow.LeftToRight)
-        self.attachmentListWidget.setWrapping(False)
-        self.attachmentListWidget.setHorizontalScrollBarPolicy(
-            Qt.ScrollBarPolicy.ScrollBarAsNeeded
-        )
-        self.attachmentListWidget.setVerticalScrollBarPolicy(
-            Qt.ScrollBarPolicy.ScrollBarAlwaysOff
-        )
-
-        main_layout.addWidget(self.attachmentListWidget, 0)
+        # 첫 첨부 시 _ensure_attachment_list()에서 생성
+        self.attachmentListWidget = None
+        self._main_layout = main_layout
 
         # --- 하단 입력 영역 ---
-        input_layout = QHBoxLayout()
+        # 처리 중 입력 요소를 한 번에 잠글 수 있도록 하나의 컨테이너에 배치
+        self.inputBar = QWidget()
+        self.inputBar.setObjectName("inputBar")
+        input_layout = QHBoxLayout(self.inputBar)
+        input_layout.setContentsMargins(0, 0, 0, 0)
         input_layout.setSpacing(8)
 
         # 파일 첨부 버튼 (왼쪽)
         self.attachButton = QPushButton("📎")
         self.attachButton.setObjectName("attachButton")
+        self.attachButton.setProperty("role", "iconBtn")
         self.attachButton.setToolTip("파일 첨부")
         # 아이콘 크기 등 스타일은 스타일시트에서 설정
         input_layout.addWidget(self.attachButton, 0)
@@ -391,16 +405,18 @@ class BongchunAgentGUI(QMainWindow):
 
         self.sttButton = QPushButton("🎤")
         self.sttButton.setObjectName("sttButton")
+        self.sttButton.setProperty("role", "iconBtn")
         self.sttButton.setToolTip("음성으로 입력 (단축키: Ctrl+Shift+S)")
         input_layout.addWidget(self.sttButton, 0)
 
         # 전송 버튼 (오른쪽)
         self.sendButton = QPushButton("➤")
         self.sendButton.setObjectName("sendButton")
+        self.sendButton.setProperty("role", "iconBtn")
         self.sendButton.setToolTip("전송 (Enter)")
         input_layout.addWidget(self.sendButton, 0)
 
-        main_layout.addLayout(input_layout)
+        main_layout.addWidget(self.inputBar)
 
         # --- 메뉴바 ---
         menu_bar = self.menuBar()
@@ -419,7 +435,43 @@ class BongchunAgentGUI(QMainWindow):
         exit_action.triggered.connect(self.close)
         file_menu.addAction(exit_action)
 
-        print("[DEBUG] UI initialized with menubar")
+        logger.debug("UI initialized with menubar")
+
+    def _init_text_formats(self):
+        """메시지 추가 시 재사용할 블록/문자 서식을 한 번만 생성"""
+        self._response_font = self.responseArea.font()
+
+        self._fmt_left_block = QTextBlockFormat()
+        self._fmt_left_block.setBottomMargin(8)
+        self._fmt_left_block.setAlignment(Qt.AlignmentFlag.AlignLeft)
+
+        self._fmt_user_block = QTextBlockFormat(self._fmt_left_block)
+        self._fmt_user_block.setAlignment(Qt.AlignmentFlag.AlignRight)
+
+        self._fmt_processing_block = QTextBlockFormat(self._fmt_left_block)
+        self._fmt_processing_block.setAlignment(Qt.AlignmentFlag.AlignCenter)
+
+        self._fmt_default_char = QTextCharFormat()
+        self._fmt_default_char.setFont(self._response_font)
+        self._fmt_default_char.setForeground(PALETTE["default"])
+
+        self._fmt_user_char = QTextCharFormat(self._fmt_default_char)
+        self._fmt_user_char.setForeground(PALETTE["user"])
+
+        self._fmt_bold_char = QTextCharFormat()
+        self._fmt_bold_char.setFontWeight(QFont.Weight.Bold)
+
+        self._fmt_processing_char = QTextCharFormat(self._fmt_default_char)
+        self._fmt_processing_char.setForeground(PALETTE["muted"])
+
+        # 시스템 메시지용 기울임 서식 (색상별)
+        self._system_char_formats = {}
+        for tone, color in PALETTE.items():
+            char_format = QTextCharFormat()
+            char_format.setFont(self._response_font)
+            char_format.setFontItalic(True)
+            char_format.setForeground(color)
+            self._system_char_formats[tone] = char_format
 
     def _connect_signals(self):
         """시그널과 슬롯 연결"""
@@ -427,33 +479,40 @@ class BongchunAgentGUI(QMainWindow):
         self.requestEntry.returnPressed.connect(self._send_request)
         self.sttButton.clicked.connect(self._start_stt)
         self.attachButton.clicked.connect(self._attach_file)
-        self.attachmentListWidget.itemDoubleClicked.connect(self._remove_attachment)
         self.requestEntry.file_pasted.connect(self._handle_pasted_files)
         self.new_chat_action.triggered.connect(self._start_new_chat)
         self.newChatButton.clicked.connect(self._start_new_chat)
+        # 워커 스레드에서 emit되므로 GUI 스레드에서 처리되도록 큐 연결 사용
+        self.app_controller.response_ready.connect(
+            self._schedule_queue_drain, Qt.ConnectionType.QueuedConnection
+        )
+        # 목록 위젯의 시그널 처리 중(더블클릭 제거 등)에 항목을 지우지 않도록 큐 연결 사용
+        self.app_controller.attachments_changed.connect(
+            self._on_attachments_changed, Qt.ConnectionType.QueuedConnection
+        )
 
         if self.hotkey_manager:
-            print("[DEBUG] Connecting hotkey_manager signals...")
+            logger.debug("Connecting hotkey_manager signals...")
             try:
                 self.hotkey_manager.show_window_signal.connect(self._toggle_window)
-                print("[DEBUG] show_window_signal connected to _toggle_window")
+                logger.debug("show_window_signal connected to _toggle_window")
                 self.hotkey_manager.activate_signal.connect(self._start_stt)
-                print("[DEBUG] activate_signal connected to _start_stt")
+                logger.debug("activate_signal connected to _start_stt")
             except AttributeError as e:
-                print(
-                    f"[DEBUG] Error connecting hotkey signals: {e} - HotkeyManager or signals might not be ready."
+                logger.warning(
+                    "Error connecting hotkey signals: %s - HotkeyManager or signals might not be ready.",
+                    e,
                 )
             except Exception as e:
-                print(f"[DEBUG] Unexpected error connecting hotkey signals: {e}")
-                traceback.print_exc()
+                logger.exception("Unexpected error connecting hotkey signals: %s", e)
         else:
-            print("[DEBUG] HotkeyManager not available, skipping signal connection.")
+            logger.debug("HotkeyManager not available, skipping signal connection.")
 
-        print("[DEBUG] Signals connected")
+        logger.debug("Signals connected")
 
     def _setup_hotkeys(self):
         """전역 단축키 설정 (AppController에서 처리하므로 내용은 비움)"""
-        print("[DEBUG] _setup_hotkeys called (registration handled by AppController).")
+        logger.debug("_setup_hotkeys called (registration handled by AppController).")
 
     def _toggle_window(self):
         """창 보이기/숨기기 토글 (AppController의 HotkeyManager가 호출)"""
@@ -466,123 +525,99 @@ class BongchunAgentGUI(QMainWindow):
 
     def _send_request(self):
         """사용자 요청 전송"""
-        print("[DEBUG] _send_request called")
+        logger.debug("_send_request called")
         request_text = self.requestEntry.text().strip()
-        if not request_text and not self.attached_files:
-            print("[DEBUG] No text or files to send.")
+        if not request_text and not self.app_controller.has_attachments():
+            logger.debug("No text or files to send.")
             return
 
         selected_prompt = self.promptComboBox.currentText()
 
-        self._append_message(f"나: {request_text}")
+        self._append_message(f"{_USER_PREFIX} {request_text}")
         self._disable_ui_elements()
         self._append_message("⏳ AI 처리 중...", is_processing=True)
         self.requestEntry.clear()
 
-        print(
-            "[DEBUG] User message shown, UI disabled, processing message shown, calling app_controller.process_user_request"
+        logger.debug(
+            "User message shown, UI disabled, processing message shown, calling app_controller.process_user_request"
         )
 
-        if self.app_controller:
-            self.app_controller.process_user_request(request_text, selected_prompt)
-        else:
-            print("[DEBUG] Error: AppController not available.")
-            self._append_message(
-                "<font color='red'>오류: AppController가 연결되지 않았습니다.</font>"
-            )
-            self._enable_ui_elements()
+        self.app_controller.process_user_request(request_text, selected_prompt)
+
+    def _set_input_enabled(self, enabled):
+        """입력 영역 활성화 상태 변경 (이미 같은 상태면 아무 작업도 하지 않음)"""
+        if enabled == self._input_enabled:
+            return
+        self._input_enabled = enabled
+        logger.debug("Setting UI elements enabled=%s", enabled)
+        self.inputBar.setEnabled(enabled)
+        if enabled:
+            self.requestEntry.setFocus()
 
     def _enable_ui_elements(self):
         """UI 입력 요소 활성화"""
-        print("[DEBUG] Enabling UI elements")
-        self.requestEntry.setEnabled(True)
-        self.sendButton.setEnabled(True)
-        self.sttButton.setEnabled(True)
-        self.requestEntry.setFocus()
+        self._set_input_enabled(True)
 
     def _disable_ui_elements(self):
         """UI 입력 요소 비활성화"""
-        print("[DEBUG] Disabling UI elements")
-        self.requestEntry.setEnabled(False)
-        self.sendButton.setEnabled(False)
-        self.sttButton.setEnabled(False)
+        self._set_input_enabled(False)
 
     def _append_message(self, message, is_processing=False):
         """응답 영역에 메시지 추가 (QTextBlockFormat 및 QTextCharFormat 사용)"""
-        cursor = self.responseArea.textCursor()
+        cursor = self._response_cursor
         cursor.movePosition(QTextCursor.MoveOperation.End)
 
-        is_user_message = message.startswith("나:") and not is_processing
-        is_ai_message = message.startswith("Agent:") and not is_processing
-        is_system_message = message.startswith("<font color=") and not is_processing
+        is_user_message = message.startswith(_USER_PREFIX) and not is_processing
+        is_ai_message = message.startswith(_AGENT_PREFIX) and not is_processing
 
         if (
             is_ai_message
             and self.processing_message_block
             and self.processing_message_block.isValid()
         ):
-            print(
-                f"[DEBUG] AI message received. Attempting to remove processing block: {self.processing_message_block.blockNumber()} (valid: {self.processing_message_block.isValid()})"
+            logger.debug(
+                "AI message received. Attempting to remove processing block: %s (valid: %s)",
+                self.processing_message_block.blockNumber(),
+                self.processing_message_block.isValid(),
             )
             temp_cursor = QTextCursor(self.processing_message_block)
             temp_cursor.select(QTextCursor.SelectionType.BlockUnderCursor)
             temp_cursor.removeSelectedText()
-            print(
-                f"[DEBUG] Successfully removed processing message block using stored object: {self.processing_message_block.blockNumber()}"
+            logger.debug(
+                "Successfully removed processing message block using stored object: %s",
+                self.processing_message_block.blockNumber(),
             )
             self.processing_message_block = None
             cursor.movePosition(QTextCursor.MoveOperation.End)
-            print("[DEBUG] Cursor moved to end after attempting removal.")
-
-        block_format = QTextBlockFormat()
-        block_format.setBottomMargin(8)
+            logger.debug("Cursor moved to end after attempting removal.")
 
-        char_format = QTextCharFormat()
-        char_format.setFont(self.responseArea.font())
-        char_format.setForeground(QColor("#E0E0E0"))
+        block_format = self._fmt_left_block
+        char_format = self._fmt_default_char
 
         message_content = message
 
         if is_user_message:
-            message_content = message[len("나:") :].strip()
-            block_format.setAlignment(Qt.AlignmentFlag.AlignRight)
-            cursor.insertBlock(block_format)
-            html_content = f"""
-            <div style='display: inline-block; max-width: 80%; color: #FFFFFF;'>
-                {message_content.replace('<', '<').replace('>', '>').replace('\\n', '<br>')}
-            </div>
-            """
-            cursor.movePosition(QTextCursor.MoveOperation.StartOfBlock)
-            cursor.insertHtml(html_content)
+            message_content = message[_USER_PREFIX_LEN:].strip()
+            # HTML 파서를 거치지 않도록 서식이 지정된 일반 텍스트로 삽입
+            cursor.insertBlock(self._fmt_user_block, self._fmt_user_char)
+            cursor.insertText(message_content, self._fmt_user_char)
 
         elif is_ai_message:
-            parts = message.split("\n", 1)
-            if len(parts) > 1:
-                prefix = parts[0]
-                content = parts[1].strip()
-                bold_format = QTextCharFormat()
-                bold_format.setFontWeight(QFont.Weight.Bold)
-                cursor.insertBlock(block_format, char_format)
-                cursor.insertText(prefix + "\n", bold_format)
-                cursor.insertText(content)
-            else:
-                message_content = message[len("Agent:") :].strip()
-                cursor.insertBlock(block_format, char_format)
-                cursor.insertText(f"Gemini:\n{message_content}")
-
-            block_format.setAlignment(Qt.AlignmentFlag.AlignLeft)
-        elif is_system_message:
-            cursor.insertHtml(message + "<br>")
-            self.responseArea.ensureCursorVisible()
-            return
+            # "Agent:" 접두어는 한 번만 잘라내고 화면에는 "Gemini:" 라벨로 표시
+            message_content = message[_AGENT_PREFIX_LEN:].strip()
+            cursor.insertBlock(block_format, char_format)
+            cursor.insertText(_AI_DISPLAY_LABEL, self._fmt_bold_char)
+            cursor.insertText(message_content, char_format)
+
         elif is_processing:
-            print(f"[DEBUG] Appending processing message: '{message}'")
+            logger.debug("Appending processing message: '%s'", message)
             if (
                 self.processing_message_block
                 and self.processing_message_block.isValid()
             ):
-                print(
-                    f"[DEBUG] Removing previous processing block before adding new one: {self.processing_message_block.blockNumber()}"
+                logger.debug(
+                    "Removing previous processing block before adding new one: %s",
+                    self.processing_message_block.blockNumber(),
                 )
                 prev_cursor = QTextCursor(self.processing_message_block)
                 prev_cursor.select(QTextCursor.SelectionType.BlockUnderCursor)
@@ -591,186 +626,231 @@ class BongchunAgentGUI(QMainWindow):
             cursor.movePosition(QTextCursor.MoveOperation.End)
 
             message_content = message
-            block_format.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            char_format.setForeground(QColor("#AAAAAA"))
-            cursor.insertBlock(block_format, char_format)
+            cursor.insertBlock(self._fmt_processing_block, self._fmt_processing_char)
             cursor.insertText(message_content)
             self.processing_message_block = cursor.block()
-            print(
-                f"[DEBUG] Stored new processing message block: {self.processing_message_block.blockNumber()} (valid: {self.processing_message_block.isValid()})"
+            logger.debug(
+                "Stored new processing message block: %s (valid: %s)",
+                self.processing_message_block.blockNumber(),
+                self.processing_message_block.isValid(),
             )
         else:
-            block_format.setAlignment(Qt.AlignmentFlag.AlignLeft)
             cursor.insertBlock(block_format, char_format)
             cursor.insertText(message_content)
-        if (
-            not is_user_message
-            and not is_ai_message
-            and not is_system_message
-            and not is_processing
-        ):
+        if not is_user_message and not is_ai_message and not is_processing:
             cursor.insertBlock(block_format, char_format)
             cursor.insertText(message_content)
 
-        self.responseArea.ensureCursorVisible()
+        self._scroll_to_latest()
+
+    def _append_system_message(self, message, tone="muted"):
+        """시스템/상태 메시지를 HTML 파싱 없이 색상 서식의 일반 텍스트로 추가 (tone은 PALETTE 키)"""
+        char_format = self._system_char_formats[tone]
+        cursor = self._response_cursor
+        cursor.movePosition(QTextCursor.MoveOperation.End)
+        cursor.insertBlock(self._fmt_left_block, char_format)
+        cursor.insertText(message, char_format)
+        self._scroll_to_latest()
+
+    def _scroll_to_latest(self):
+        """마지막 메시지가 보이도록 스크롤 (큐 처리 중에는 끝날 때 한 번만)"""
+        if not self._draining_queue:
+            self.responseArea.ensureCursorVisible()
+
+    def _is_window_hidden(self):
+        """창이 숨겨졌거나 최소화되어 화면에 그릴 필요가 없는지 여부"""
+        return not self.isVisible() or self.isMinimized()
+
+    def _schedule_queue_drain(self):
+        """응답 큐 처리를 한 프레임(16ms) 단위로 모아 한 번만 예약"""
+        if self._drain_scheduled:
+            return
+        self._drain_scheduled = True
+        QTimer.singleShot(16, self._process_response_queue)
 
     def _process_response_queue(self):
-        """AppController의 응답 큐를 처리하여 GUI 업데이트"""
+        """
+        AppController의 응답 큐를 처리하여 GUI 업데이트.
+        창이 보이지 않는 동안에는 응답 영역에 그리는 메시지만 미뤄 두고 제어 메시지는 바로 처리하며,
+        창이 다시 보이면 미뤄 둔 메시지를 먼저 그림
+        """
+        self._drain_scheduled = False
+        self._draining_queue = True
+        response_queue = self.app_controller.response_queue
+        hidden_messages = self._hidden_messages
+        hidden = self._is_window_hidden()
+        # 여러 메시지를 추가하는 동안 다시 그리기를 멈추고 끝난 뒤 한 번만 그림
+        self.responseArea.setUpdatesEnabled(False)
         try:
-            while not self.app_controller.response_queue.empty():
-                message = self.app_controller.response_queue.get_nowait()
-                print(f"[DEBUG] Processing queue message: '{message}'")
-
-                if message.startswith("User"):
-                    print(f"[DEBUG] Ignoring User message from queue: '{message}'")
-                    continue
-
-                elif message.startswith("AI\n"):
-                    ai_msg = message[len("AI\n") :]
-                    self._append_message(f"Agent:\n{ai_msg}")
-                elif message.startswith("System:"):
-                    system_msg = message[len("System: ") :]
-                    if system_msg == "AI 처리 중...":
-                        print(
-                            "[DEBUG] Ignoring 'System: AI 처리 중...' message from queue."
-                        )
+            for _ in range(_MAX_MESSAGES_PER_DRAIN):
+                if hidden_messages and not hidden:
+                    kind, payload = hidden_messages.popleft()
+                # 꺼내는 쪽은 GUI 스레드 하나뿐이므로 확인 후 popleft 해도 안전
+                elif response_queue:
+                    kind, payload = response_queue.popleft()
+                    if hidden and kind not in _IMMEDIATE_WHILE_HIDDEN:
+                        hidden_messages.append((kind, payload))
                         continue
-                    elif system_msg == "Buttons enabled":
-                        self._enable_ui_elements()
-                    elif system_msg == "Buttons disabled":
-                        self._disable_ui_elements()
-                    elif system_msg == "Clear chat display":
-                        self.responseArea.clear()
-                    elif system_msg == "Clear attachment label":
-                        self.attachmentListWidget.clear()
-                        self.attachmentListWidget.setVisible(False)
-                    elif system_msg == "Show recording status":
-                        print("[UI HINT] Show recording status indicator")
-                        self._append_message("<i>음성 녹음 중...</i>")
-                    elif system_msg == "Hide recording status":
-                        print("[UI HINT] Hide recording status indicator")
-                    else:
-                        color = (
-                            "orange"
-                            if "경고" in system_msg
-                            else "red" if "오류" in system_msg else "#AAAAAA"
-                        )
-                        self._append_message(
-                            f"<font color='{color}'><i>{system_msg}</i></font>"
-                        )
                 else:
-                    print(f"[DEBUG] Unknown message format in queue: '{message}'")
-                    if "⏳ AI 처리 중..." not in message:
-                        print(f"[DEBUG] Appending unknown message: '{message}'")
-                        self._append_message(
-                            f"<font color='gray'><i>알 수 없는 시스템 메시지: {message}</i></font>"
-                        )
-                    else:
-                        print(
-                            f"[DEBUG] Skipped displaying unknown message containing processing indicator: '{message}'"
-                        )
-
-        except queue.Empty:
-            pass
+                    break
+                logger.debug("Processing queue message: %r '%s'", kind, payload)
+
+                handler = self._message_handlers.get(kind)
+                if handler:
+                    handler(payload)
+                else:
+                    logger.debug("Unknown message kind in queue: %r", kind)
+                    self._append_system_message(
+                        f"알 수 없는 시스템 메시지: {payload}", "unknown"
+                    )
+
         except Exception as e:
-            print(f"[DEBUG] Error processing response queue: {e}")
-            traceback.print_exc()
-            self._append_message(
-                f"<font color='red'>오류: 응답 처리 중 문제 발생 - {e}</font>"
-            )
+            logger.exception("Error processing response queue: %s", e)
+            self._append_system_message(f"오류: 응답 처리 중 문제 발생 - {e}", "err")
+        finally:
+            self._draining_queue = False
+            self.responseArea.setUpdatesEnabled(True)
+            self.responseArea.ensureCursorVisible()
+            if response_queue or (hidden_messages and not hidden):
+                self._schedule_queue_drain()
+
+    def _clear_chat(self):
+        """응답 영역과 아직 그리지 않은 채팅 메시지를 모두 비움"""
+        self._hidden_messages.clear()
+        self.responseArea.clear()
+
+    def _show_ai_response(self, text):
+        """AI 응답 표시"""
+        self._append_message(f"{_AGENT_PREFIX}\n{text}")
+
+    def _show_status_message(self, text):
+        """시스템 상태 문구 표시 (경고/오류는 색상으로 구분)"""
+        tone = "warn" if "경고" in text else "err" if "오류" in text else "muted"
+        self._append_system_message(text, tone)
+
+    def _show_recording_status(self):
+        """음성 녹음 상태 표시"""
+        logger.debug("Show recording status indicator")
+        self._append_system_message("음성 녹음 중...")
+
+    def _hide_recording_status(self):
+        """음성 녹음 상태 숨김"""
+        logger.debug("Hide recording status indicator")
 
     def _attach_file(self):
         """파일 첨부 대화상자 열기"""
-        print("[DEBUG] _attach_file called")
+        logger.debug("_attach_file called")
         file_paths, _ = QFileDialog.getOpenFileNames(
             self, "파일 첨부", "", "모든 파일 (*.*)"
         )
         if file_paths:
-            print(f"[DEBUG] Files selected: {file_paths}")
-            for file_path in file_paths:
-                if file_path not in self.attached_files:
-                    if self.app_controller.attach_file(file_path):
-                        item = QListWidgetItem(os.path.basename(file_path))
-                        item.setData(Qt.ItemDataRole.UserRole, file_path)
-                        item.setToolTip(file_path)
-                        self.attachmentListWidget.addItem(item)
-                    else:
-                        print(f"[DEBUG] File not added by AppController: {file_path}")
-            if self.attachmentListWidget.count() > 0:
-                self.attachmentListWidget.setVisible(True)
-                QApplication.processEvents()
-                print(
-                    f"[DEBUG] _attach_file: attachmentListWidget visibility after setVisible(True): {self.attachmentListWidget.isVisible()}"
-                )
-                print(
-                    f"[DEBUG] _attach_file: attachmentListWidget size: {self.attachmentListWidget.size()}"
-                )
+            logger.debug("Files selected: %s", file_paths)
+            self._add_attachments(file_paths)
 
     def _handle_pasted_files(self, file_paths):
         """붙여넣기된 파일 처리"""
-        print(f"[DEBUG] _handle_pasted_files called with: {file_paths}")
+        logger.debug("_handle_pasted_files called with: %s", file_paths)
         if file_paths:
-            for file_path in file_paths:
-                if file_path not in self.attached_files:
-                    if self.app_controller.attach_file(file_path):
-                        item = QListWidgetItem(os.path.basename(file_path))
-                        item.setData(Qt.ItemDataRole.UserRole, file_path)
-                        item.setToolTip(file_path)
-                        self.attachmentListWidget.addItem(item)
-                        print(f"[DEBUG] File attached via paste: {file_path}")
-                    else:
-                        print(
-                            f"[DEBUG] File not added by AppController (paste): {file_path}"
-                        )
-            if self.attachmentListWidget.count() > 0:
-                self.attachmentListWidget.setVisible(True)
-                QApplication.processEvents()
-                print(
-                    f"[DEBUG] _handle_pasted_files: attachmentListWidget visibility after setVisible(True): {self.attachmentListWidget.isVisible()}"
-                )
-                print(
-                    f"[DEBUG] _handle_pasted_files: attachmentListWidget size: {self.attachmentListWidget.size()}"
-                )
+            self._add_attachments(file_paths)
+
+    def _ensure_attachment_list(self):
+        """첨부 파일 목록 위젯을 처음 필요할 때 생성하여 입력 영역 위에 배치"""
+        if self.attachmentListWidget is not None:
+            return self.attachmentListWidget
+
+        widget = QListWidget()
+        widget.setObjectName("attachmentListWidget")
+        widget.setSizePolicy(
+            QSizePolicy.Policy.Expanding,
+            QSizePolicy.Policy.Fixed,
+        )
+        widget.setFixedHeight(40)
+        widget.setVisible(False)
+        # Flow layout 설정 (가로 스크롤)
+        widget.setFlow(QListWidget.Flow.LeftToRight)
+        widget.setWrapping(False)
+        widget.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAsNeeded)
+        widget.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        widget.itemDoubleClicked.connect(self._remove_attachment)
+
+        # 마지막 항목이 하단 입력 영역이므로 그 바로 앞에 삽입
+        self._main_layout.insertWidget(self._main_layout.count() - 1, widget, 0)
+        self.attachmentListWidget = widget
+        return widget
+
+    def _add_attachments(self, file_paths):
+        """파일들을 AppController에 한 번에 첨부 (목록은 attachments_changed로 갱신됨)"""
+        added = self.app_controller.attach_files(file_paths)
+        logger.debug("Files attached: %d of %d", added, len(file_paths))
+
+    def _on_attachments_changed(self, attachments):
+        """AppController가 보낸 (경로, 파일명) 목록을 저장하고 위젯에 반영"""
+        self._current_attachments = attachments
+        self._update_attachment_list()
+
+    def _update_attachment_list(self):
+        """저장된 첨부 목록으로 목록 위젯을 다시 채움"""
+        attachments = self._current_attachments
+        widget = self.attachmentListWidget
+        if not attachments:
+            # 요청마다 비우기 알림이 오므로 이미 비어 있으면(숨겨진 상태) 아무 작업도 하지 않음
+            if widget is None or widget.count() == 0:
+                return
+            widget.clear()
+            widget.setVisible(False)
+            return
+
+        widget = self._ensure_attachment_list()
+        # 항목마다 레이아웃/다시 그리기가 일어나지 않도록 채우기가 끝날 때까지 막아둠
+        widget.setUpdatesEnabled(False)
+        try:
+            with QSignalBlocker(widget):
+                widget.clear()
+                # 반복문 안에서 속성 조회를 반복하지 않도록 지역 변수로 꺼내둠
+                user_role = Qt.ItemDataRole.UserRole
+                add_item = widget.addItem
+                for file_path, filename in attachments:
+                    item = QListWidgetItem(filename)
+                    item.setData(user_role, file_path)
+                    item.setToolTip(file_path)
+                    add_item(item)
+        finally:
+            widget.setUpdatesEnabled(True)
+
+        # 다시 그리기는 슬롯이 끝난 뒤 이벤트 루프가 처리
+        widget.setVisible(True)
+        logger.debug("_update_attachment_list: %d items", len(attachments))
 
     def _remove_attachment(self, item):
         """첨부 파일 목록에서 항목 제거"""
         file_path_to_remove = item.data(Qt.ItemDataRole.UserRole)
-        print(f"[DEBUG] _remove_attachment called for: {file_path_to_remove}")
-        row = self.attachmentListWidget.row(item)
-        self.attachmentListWidget.takeItem(row)
-        if self.app_controller:
-            self.app_controller.remove_attachment(file_path_to_remove)
-        else:
-            print("[DEBUG] Error: AppController not available to remove attachment.")
-
-        if self.attachmentListWidget.count() == 0:
-            self.attachmentListWidget.setVisible(False)
+        logger.debug("_remove_attachment called for: %s", file_path_to_remove)
+        self.app_controller.remove_attachment(file_path_to_remove)
 
     def _start_stt(self):
         """음성-텍스트 변환 시작 (AppController 호출)"""
-        print("[DEBUG] _start_stt called")
+        logger.debug("_start_stt called")
 
-        if self.app_controller:
-            print("[DEBUG] Calling app_controller.handle_voice_input()")
-            self.app_controller.handle_voice_input()
-        else:
-            print("[DEBUG] Error: AppController not available for STT.")
-            self._append_message(
-                "<font color='red'>오류: AppController가 연결되지 않아 음성 입력을 시작할 수 없습니다.</font>"
-            )
+        self.app_controller.handle_voice_input()
 
     def _start_new_chat(self):
         """새로운 대화 시작 (AppController 호출)"""
-        print("[DEBUG] _start_new_chat called")
-        if self.app_controller:
-            self.app_controller.start_new_chat_session()
-        else:
-            print("[DEBUG] Error: AppController not available to start new chat.")
-            self._append_message(
-                "<font color='red'>오류: AppController가 연결되지 않아 새 대화를 시작할 수 없습니다.</font>"
-            )
+        logger.debug("_start_new_chat called")
+        self.app_controller.start_new_chat_session()
+
+    def showEvent(self, event):
+        """창이 다시 표시되면 숨겨진 동안 미뤄 둔 메시지를 그림"""
+        super().showEvent(event)
+        if self._hidden_messages:
+            self._schedule_queue_drain()
+
+    def changeEvent(self, event):
+        """최소화가 해제되면 미뤄 둔 메시지를 그림"""
+        super().changeEvent(event)
+        if event.type() == QEvent.Type.WindowStateChange and self._hidden_messages:
+            self._schedule_queue_drain()
 
     def closeEvent(self, event):
         """창 닫기 이벤트 처리"""
-        print("[DEBUG] closeEvent called")
+        logger.debug("closeEvent called")
         event.accept()
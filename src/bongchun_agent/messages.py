@@ -0,0 +1,15 @@
+from enum import IntEnum
+
+
+class MessageKind(IntEnum):
+    """AppController가 응답 큐를 통해 GUI로 보내는 메시지 종류"""
+
+    USER = 1  # 사용자 입력 (GUI가 이미 표시함)
+    AI = 2  # AI 응답 본문
+    STATUS = 3  # 화면에 표시할 시스템 상태/경고/오류 문구
+    PROCESSING = 4  # AI 처리 시작 알림
+    BUTTONS_ENABLED = 5
+    BUTTONS_DISABLED = 6
+    CLEAR_CHAT = 7
+    SHOW_RECORDING = 8
+    HIDE_RECORDING = 9
@@ -1,20 +1,36 @@
 import os
+from typing import Callable
 
-from PyQt6.QtWidgets import QMessageBox
 from .app_config import NO_PROMPT_OPTION
 
 
+def _print_error(title: str, message: str):
+    """기본 오류 보고 함수 (GUI 없이 콘솔에 출력)"""
+    print(f"{title}: {message}")
+
+
 class PromptManager:
     """프롬프트 로딩 및 관리를 담당하는 클래스"""
 
-    def __init__(self, prompt_dir="prompt"):
+    def __init__(
+        self,
+        prompt_dir="prompt",
+        on_error: Callable[[str, str], None] = _print_error,
+    ):
         """
         PromptManager를 초기화합니다.
 
         Args:
             prompt_dir (str): 프롬프트 파일이 있는 디렉토리 경로.
+            on_error (Callable[[str, str], None]): (제목, 메시지)를 받아 오류를 보고하는 함수.
+                GUI에서는 대화상자를 띄우는 함수를 전달합니다.
         """
         self.prompt_dir = prompt_dir
+        self._on_error = on_error
+        # 파일 경로별 (수정 시각, 내용) 캐시 (파일이 바뀐 경우에만 다시 읽음)
+        self._prompt_cache: dict[str, tuple[float, str]] = {}
+        # 프롬프트 이름 -> 파일 경로 (목록을 읽을 때 한 번만 계산)
+        self._prompt_paths: dict[str, str] = {}
         if not os.path.isdir(self.prompt_dir):
             print(
                 f"경고: 프롬프트 디렉토리 '{self.prompt_dir}'를 찾을 수 없습니다. 생성합니다."
@@ -22,7 +38,7 @@ class PromptManager:
             try:
                 os.makedirs(self.prompt_dir)
             except OSError as e:
-                QMessageBox.critical(None, "오류", f"프롬프트 디렉토리 생성 실패: {e}")
+                self._on_error("오류", f"프롬프트 디렉토리 생성 실패: {e}")
                 self.default_prompt_path = None
                 self.default_system_prompt = None
                 self.available_prompts = [NO_PROMPT_OPTION]
@@ -43,17 +59,14 @@ class PromptManager:
         """기본 시스템 프롬프트 파일(default.txt)의 내용을 로드합니다."""
         if self.default_prompt_path and os.path.exists(self.default_prompt_path):
             try:
-                with open(self.default_prompt_path, "r", encoding="utf-8") as f:
-                    content = f.read()
-                    print(f"기본 시스템 프롬프트 로드됨: {self.default_prompt_path}")
-                    return content
+                content = self._read_prompt_file(self.default_prompt_path)
+                print(f"기본 시스템 프롬프트 로드됨: {self.default_prompt_path}")
+                return content
             except OSError as e:
-                QMessageBox.critical(
-                    None, "오류", f"기본 프롬프트 파일을 읽을 수 없습니다: {e}"
-                )
+                self._on_error("오류", f"기본 프롬프트 파일을 읽을 수 없습니다: {e}")
             except Exception as e:
-                QMessageBox.critical(
-                    None, "오류", f"기본 프롬프트 읽기 중 예상치 못한 오류 발생: {e}"
+                self._on_error(
+                    "오류", f"기본 프롬프트 읽기 중 예상치 못한 오류 발생: {e}"
                 )
         else:
             print(
@@ -62,22 +75,56 @@ class PromptManager:
         return None
 
     def _load_prompts(self):
-        """프롬프트 디렉토리에서 .txt 파일 이름(확장자 제외)을 로드하고 '없음' 옵션을 추가합니다."""
+        """
+        프롬프트 디렉토리에서 .txt 파일 이름(확장자 제외)을 로드하고 '없음' 옵션을 추가합니다.
+        목록을 만들면서 각 파일 내용도 미리 읽어 캐시에 넣어 둡니다.
+        """
         prompts = [NO_PROMPT_OPTION]
         if os.path.isdir(self.prompt_dir):
             try:
-                for filename in os.listdir(self.prompt_dir):
-                    if filename.endswith(".txt") and filename != "default.txt":
-                        prompts.append(os.path.splitext(filename)[0])
+                with os.scandir(self.prompt_dir) as entries:
+                    for entry in entries:
+                        if (
+                            not entry.name.endswith(".txt")
+                            or entry.name == "default.txt"
+                            or not entry.is_file()
+                        ):
+                            continue
+                        prompt_name = os.path.splitext(entry.name)[0]
+                        prompts.append(prompt_name)
+                        self._prompt_paths[prompt_name] = entry.path
+                        try:
+                            self._read_prompt_file(entry.path)
+                        except (OSError, UnicodeDecodeError) as e:
+                            # 선택 시 다시 읽으면서 오류를 표시하므로 여기서는 경고만 출력
+                            print(
+                                f"경고: 프롬프트 파일 미리 읽기 실패 - {entry.path}: {e}"
+                            )
             except OSError as e:
-                QMessageBox.critical(
-                    None, "오류", f"프롬프트 디렉토리를 읽을 수 없습니다: {e}"
-                )
+                self._on_error("오류", f"프롬프트 디렉토리를 읽을 수 없습니다: {e}")
 
         if len(prompts) == 1:
             print("경고: 'prompt' 디렉토리에서 추가 프롬프트를 찾을 수 없습니다.")
         return prompts
 
+    def _read_prompt_file(self, path):
+        """
+        프롬프트 파일 내용을 반환합니다. 수정 시각이 캐시와 같으면 다시 읽지 않습니다.
+
+        Raises:
+            FileNotFoundError: 파일이 없는 경우.
+            OSError: 파일 정보를 확인하거나 읽을 수 없는 경우.
+        """
+        mtime = os.stat(path).st_mtime
+        cached = self._prompt_cache.get(path)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+
+        with open(path, "r", encoding="utf-8") as f:
+            content = f.read()
+        self._prompt_cache[path] = (mtime, content)
+        return content
+
     def load_selected_prompt(self, prompt_name):
         """선택된 *추가* 프롬프트 파일의 내용을 로드하여 반환합니다."""
         if prompt_name == NO_PROMPT_OPTION:
@@ -87,26 +134,22 @@ class PromptManager:
             print("추가 프롬프트 이름이 비어 있습니다.")
             return ""
 
-        prompt_file_path = os.path.join(self.prompt_dir, f"{prompt_name}.txt")
+        prompt_file_path = self._prompt_paths.get(prompt_name)
+        if prompt_file_path is None:
+            print(f"경고: 알 수 없는 프롬프트 '{prompt_name}'이(가) 선택되었습니다.")
+            return ""
 
         try:
-            if os.path.exists(prompt_file_path):
-                with open(prompt_file_path, "r", encoding="utf-8") as f:
-                    content = f.read()
-                print(f"추가 프롬프트 내용 로드됨: {prompt_file_path}")
-                return content
-            else:
-                QMessageBox.critical(
-                    None,
-                    "오류",
-                    f"선택한 프롬프트 파일 '{prompt_file_path}'을(를) 예기치 않게 찾을 수 없습니다.",
-                )
-                return ""
+            return self._read_prompt_file(prompt_file_path)
+        except FileNotFoundError:
+            self._on_error(
+                "오류",
+                f"선택한 프롬프트 파일 '{prompt_file_path}'을(를) 예기치 않게 찾을 수 없습니다.",
+            )
+            return ""
         except OSError as e:
-            QMessageBox.critical(None, "오류", f"프롬프트 파일을 읽을 수 없습니다: {e}")
+            self._on_error("오류", f"프롬프트 파일을 읽을 수 없습니다: {e}")
             return ""
         except Exception as e:
-            QMessageBox.critical(
-                None, "오류", f"프롬프트 읽기 중 예상치 못한 오류 발생: {e}"
-            )
+            self._on_error("오류", f"프롬프트 읽기 중 예상치 못한 오류 발생: {e}")
             return ""
@@ -1,13 +1,12 @@
 import sys
 import os
+import asyncio
+import collections
+import concurrent.futures
 import threading
 import queue
 import time
 import traceback
-import io
-import wave
-
-import torch
 
 try:
     from faster_whisper import WhisperModel
@@ -30,6 +29,9 @@ SAMPLE_RATE = 16000
 RECORD_SECONDS = 10
 SILENCE_THRESHOLD = 500
 SILENCE_DURATION = 1.5
+SILENCE_DURATION_NS = int(SILENCE_DURATION * 1_000_000_000)
+BLOCK_SIZE = int(SAMPLE_RATE * 0.1)
+BLOCK_POOL_SIZE = 16
 
 
 class STTService:
@@ -42,7 +44,9 @@ class STTService:
         provider="whisper",
         whisper_model_name="base",
         whisper_device_preference="auto",
+        whisper_compute_type="auto",
         google_lang_code="ko-KR",
+        warmup=True,
     ):
         """
         서비스 초기화 및 선택된 STT 제공자 설정
@@ -50,11 +54,22 @@ class STTService:
             provider (str): 사용할 STT 제공자 ('whisper' 또는 'google')
             whisper_model_name (str): Whisper 사용 시 모델 이름 또는 경로
             whisper_device_preference (str): Whisper 사용 시 장치 설정 ('auto', 'cpu', 'mps', 'cuda')
+            whisper_compute_type (str): Whisper 연산 타입 ('auto'이면 CUDA는 int8_float16, CPU는 int8)
             google_lang_code (str): Google Cloud STT 사용 시 언어 코드
+            warmup (bool): Whisper 사용 시 로드 직후 무음으로 한 번 변환하여 첫 변환 지연을 줄일지 여부
         """
         self.provider = provider
         self.audio_queue = queue.Queue()
         self.stop_recording_event = threading.Event()
+        # 오래 걸리는 변환 작업이 asyncio 기본 스레드 풀을 점유하지 않도록 전용 실행기 사용
+        self._stt_executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="stt"
+        )
+        # 녹음 데이터를 모을 int16 버퍼 (첫 녹음 시 최대 길이로 한 번만 할당하여 재사용)
+        self._record_buffer = None
+        # 오디오 콜백이 블록을 복사해 넣을 미리 할당된 버퍼 풀과 사용 가능한 버퍼 인덱스
+        self._block_pool = []
+        self._free_blocks = collections.deque()
 
         self.whisper_model = None
         self.whisper_device = None
@@ -64,7 +79,10 @@ class STTService:
         if self.provider == "whisper":
             self.whisper_model_name = whisper_model_name
             self.whisper_device_preference = whisper_device_preference
+            self.whisper_compute_type = whisper_compute_type
             self._load_whisper_model()
+            if warmup:
+                self._warmup_whisper_model()
         elif self.provider == "google":
             if speech is None:
                 raise RuntimeError(
@@ -91,10 +109,22 @@ class STTService:
         )
         device = "cpu"
 
-        if self.whisper_device_preference == "cpu":
+        # torch는 장치 감지에만 쓰이고 import 비용이 크므로 Whisper 사용 시에만 불러옴
+        try:
+            import torch
+        except ImportError:
+            torch = None
+        preference = self.whisper_device_preference
+        if torch is None and preference != "cpu":
+            print(
+                "경고: torch를 찾을 수 없어 GPU 장치를 감지할 수 없습니다. CPU를 사용합니다."
+            )
+            preference = "cpu"
+
+        if preference == "cpu":
             print("사용자 설정에 따라 CPU를 사용합니다.")
             device = "cpu"
-        elif self.whisper_device_preference == "cuda":
+        elif preference == "cuda":
             if torch.cuda.is_available():
                 print("사용자 설정 'cuda' 확인됨. CUDA GPU를 사용합니다.")
                 device = "cuda"
@@ -103,7 +133,7 @@ class STTService:
                     "경고: 사용자 설정 'cuda'이지만 CUDA를 사용할 수 없습니다. CPU로 fallback합니다."
                 )
                 device = "cpu"
-        elif self.whisper_device_preference == "mps":
+        elif preference == "mps":
             if hasattr(torch.backends, "mps") and torch.backends.mps.is_available():
                 print("사용자 설정 'mps' 확인됨. MPS (Apple Silicon GPU)를 사용합니다.")
                 device = "mps"
@@ -112,7 +142,7 @@ class STTService:
                     "경고: 사용자 설정 'mps'이지만 MPS를 사용할 수 없습니다. CPU로 fallback합니다."
                 )
                 device = "cpu"
-        elif self.whisper_device_preference == "auto":
+        elif preference == "auto":
             if torch.cuda.is_available():
                 print("자동 감지: CUDA GPU 사용 가능. 장치를 'cuda'로 설정합니다.")
                 device = "cuda"
@@ -125,14 +155,24 @@ class STTService:
                 print("자동 감지: CUDA/MPS 사용 불가. CPU를 사용합니다.")
                 device = "cpu"
 
+        if device == "mps":
+            # CTranslate2(faster-whisper 백엔드)는 MPS를 지원하지 않음
+            print("faster-whisper는 MPS를 지원하지 않으므로 CPU로 실행합니다.")
+            device = "cpu"
+
+        compute_type = self.whisper_compute_type
+        if compute_type == "auto":
+            compute_type = "int8_float16" if device == "cuda" else "int8"
+
         print(
-            f"실제 WhisperModel 로드 시도 모델: '{self.whisper_model_name}', 장치: '{device}'"
+            f"실제 WhisperModel 로드 시도 모델: '{self.whisper_model_name}', 장치: '{device}', 연산 타입: '{compute_type}'"
         )
         try:
             self.whisper_model = WhisperModel(
                 self.whisper_model_name,
                 device=device,
-                compute_type="int8",
+                compute_type=compute_type,
+                cpu_threads=os.cpu_count() or 0,
                 download_root="../models",
             )
             self.whisper_device = device
@@ -145,11 +185,34 @@ class STTService:
                 f"Whisper 모델 '{self.whisper_model_name}' 로드 실패"
             ) from e
 
+    def _warmup_whisper_model(self):
+        """1초 무음을 변환하여 첫 변환 시 발생하는 커널 선택/스레드 준비 비용을 미리 치름"""
+        print("Whisper 모델 예열 중...")
+        try:
+            segments, _info = self.whisper_model.transcribe(
+                np.zeros(SAMPLE_RATE, dtype=np.float32), language="ko"
+            )
+            # segments는 지연 생성되므로 끝까지 소비해야 실제로 디코딩이 실행됨
+            for _segment in segments:
+                pass
+            print("Whisper 모델 예열 완료.")
+        except Exception as e:
+            # 예열 실패는 치명적이지 않으므로 경고만 출력
+            print(f"경고: Whisper 모델 예열 실패: {e}")
+
     def _audio_callback(self, indata, frames, time, status):
         """사운드 장치에서 호출되는 콜백 함수"""
         if status:
             print(f"오디오 콜백 상태: {status}", file=sys.stderr)
-        self.audio_queue.put(indata.copy())
+        # 실시간 오디오 스레드에서 메모리를 할당하지 않도록 풀의 버퍼를 재사용
+        try:
+            index = self._free_blocks.popleft()
+        except IndexError:
+            # 소비 쪽이 밀려 모든 버퍼가 사용 중이면 풀을 하나 늘림
+            index = len(self._block_pool)
+            self._block_pool.append(np.empty(BLOCK_SIZE, dtype=np.int16))
+        np.copyto(self._block_pool[index][:frames], indata[:, 0])
+        self.audio_queue.put((index, frames))
 
     def record_audio(self):
         """
@@ -169,37 +232,55 @@ class STTService:
 
         stream = None
         try:
+            if not self._block_pool:
+                self._block_pool = [
+                    np.empty(BLOCK_SIZE, dtype=np.int16) for _ in range(BLOCK_POOL_SIZE)
+                ]
+            # 이전 녹음에서 큐에 남은 블록이 있더라도 모든 버퍼를 다시 사용 가능으로 표시
+            self._free_blocks = collections.deque(range(len(self._block_pool)))
             stream = sd.InputStream(
                 samplerate=SAMPLE_RATE,
                 channels=1,
                 dtype="int16",
                 callback=self._audio_callback,
-                blocksize=int(SAMPLE_RATE * 0.1),
+                blocksize=BLOCK_SIZE,
             )
             stream.start()
 
-            recorded_frames = []
             silent_frames = 0
             total_frames = 0
             frames_per_second = SAMPLE_RATE
             silence_limit = int(SILENCE_DURATION * frames_per_second)
             max_frames = int(RECORD_SECONDS * frames_per_second)
-            last_sound_time = time.time()
+            if self._record_buffer is None:
+                self._record_buffer = np.empty(max_frames, dtype=np.int16)
+            record_buffer = self._record_buffer
+            # 시스템 시각 변경의 영향을 받지 않는 단조 시계(ns 정수)로 침묵 시간을 잼
+            last_sound_ns = time.monotonic_ns()
+            # sqrt/float 변환 없이 비교하기 위해 임계값을 제곱 합 기준으로 바꿔 둠
+            silence_sum_sq_per_sample = SILENCE_THRESHOLD * SILENCE_THRESHOLD
 
             while not self.stop_recording_event.is_set():
                 try:
-                    frame = self.audio_queue.get(timeout=0.1)
-                    recorded_frames.append(frame)
-                    current_frames = len(frame)
+                    index, frames = self.audio_queue.get(timeout=0.1)
+                    samples = self._block_pool[index][:frames]
+                    current_frames = min(len(samples), max_frames - total_frames)
+                    record_buffer[total_frames : total_frames + current_frames] = (
+                        samples[:current_frames]
+                    )
                     total_frames += current_frames
 
-                    rms = np.sqrt(np.mean(frame.astype(np.float32) ** 2))
-                    if rms < SILENCE_THRESHOLD:
-                        if time.time() - last_sound_time > SILENCE_DURATION:
+                    # int16 그대로 int64 누적 제곱 합 계산 (rms < 임계값 과 동일한 판정)
+                    sum_sq = np.einsum("i,i->", samples, samples, dtype=np.int64)
+                    # 블록 데이터를 모두 사용했으므로 콜백이 다시 쓸 수 있게 반환
+                    self._free_blocks.append(index)
+                    now_ns = time.monotonic_ns()
+                    if sum_sq < silence_sum_sq_per_sample * samples.size:
+                        if now_ns - last_sound_ns > SILENCE_DURATION_NS:
                             print("녹음 중지 (침묵 감지).")
                             break
                     else:
-                        last_sound_time = time.time()
+                        last_sound_ns = now_ns
                         silent_frames = 0
 
                     if total_frames >= max_frames:
@@ -207,7 +288,7 @@ class STTService:
                         break
 
                 except queue.Empty:
-                    if time.time() - last_sound_time > SILENCE_DURATION:
+                    if time.monotonic_ns() - last_sound_ns > SILENCE_DURATION_NS:
                         print("녹음 중지 (타임아웃 후 침묵 감지).")
                         break
                     if total_frames >= max_frames:
@@ -241,32 +322,35 @@ class STTService:
                     print(f"오디오 스트림 정리 중 오류: {e}")
             print("녹음 완료.")
 
-        if not recorded_frames:
+        if total_frames == 0:
             print("녹음된 데이터가 없습니다.")
             return None
 
         try:
-            audio_data = np.concatenate(recorded_frames, axis=0)
-            audio_float32 = audio_data.flatten().astype(np.float32) / 32768.0
-            return audio_float32
+            # int16 -> float32 변환과 정규화를 한 번에 수행 (버퍼는 재사용하므로 새 배열로 반환)
+            return np.multiply(
+                record_buffer[:total_frames],
+                np.float32(1.0 / 32768.0),
+                dtype=np.float32,
+            )
         except Exception as e:
             print(f"녹음 데이터 처리 중 오류: {e}")
             traceback.print_exc()
             return None
 
-    def _numpy_to_wav_bytes(self, audio_data_np: np.ndarray) -> bytes:
-        """NumPy float32 오디오 데이터를 WAV 형식의 바이트 스트림으로 변환"""
+    def _numpy_to_pcm16_bytes(self, audio_data_np: np.ndarray) -> bytes:
+        """NumPy float32 오디오 데이터를 헤더 없는 16비트 PCM(LINEAR16) 바이트로 변환"""
         if audio_data_np is None or audio_data_np.size == 0:
             return b""
-        audio_data_int16 = (audio_data_np * 32767).astype(np.int16)
-
-        bytes_io = io.BytesIO()
-        with wave.open(bytes_io, "wb") as wf:
-            wf.setnchannels(1)
-            wf.setsampwidth(2)
-            wf.setframerate(SAMPLE_RATE)
-            wf.writeframes(audio_data_int16.tobytes())
-        return bytes_io.getvalue()
+        # 스케일 곱과 int16 변환을 한 번에 수행하여 중간 float 배열을 만들지 않음
+        audio_data_int16 = np.empty(audio_data_np.shape, dtype=np.int16)
+        np.multiply(
+            audio_data_np,
+            np.float32(32767.0),
+            out=audio_data_int16,
+            casting="unsafe",
+        )
+        return audio_data_int16.tobytes()
 
     def transcribe_audio(self, audio_data_np: np.ndarray) -> str:
         """
@@ -288,6 +372,13 @@ class STTService:
             print(f"오류: 알 수 없는 STT 제공자 '{self.provider}'")
             return ""
 
+    async def atranscribe(self, audio_data_np: np.ndarray) -> str:
+        """transcribe_audio를 STT 전용 스레드에서 실행하는 비동기 버전"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._stt_executor, self.transcribe_audio, audio_data_np
+        )
+
     def _transcribe_whisper(self, audio_data_np: np.ndarray) -> str:
         """Whisper를 사용하여 변환"""
         if self.whisper_model is None:
@@ -295,8 +386,12 @@ class STTService:
             return ""
         print(f"Whisper로 음성 변환 중 (장치: {self.whisper_device})...")
         try:
+            # Silero VAD로 앞뒤/중간의 무음 구간을 잘라 내어 인코딩할 길이를 줄임
             segments, _info = self.whisper_model.transcribe(
-                audio_data_np, language="ko"
+                audio_data_np,
+                language="ko",
+                vad_filter=True,
+                vad_parameters=dict(min_silence_duration_ms=500),
             )
             transcribed_text = "".join(segment.text for segment in segments).strip()
             print("Whisper 변환 완료.")
@@ -314,9 +409,10 @@ class STTService:
 
         print(f"Google Cloud STT로 음성 변환 중 (언어: {self.google_lang_code})...")
         try:
-            audio_bytes = self._numpy_to_wav_bytes(audio_data_np)
+            # RecognitionConfig에 형식과 샘플레이트를 지정하므로 WAV 헤더 없이 그대로 전송
+            audio_bytes = self._numpy_to_pcm16_bytes(audio_data_np)
             if not audio_bytes:
-                print("오류: 오디오 데이터를 WAV 바이트로 변환 실패.")
+                print("오류: 오디오 데이터를 PCM 바이트로 변환 실패.")
                 return ""
 
             audio = speech.RecognitionAudio(content=audio_bytes)
@@ -373,6 +469,7 @@ async def test_stt_service():
             provider=test_provider,
             whisper_model_name=os.getenv("WHISPER_MODEL", "base"),
             whisper_device_preference=os.getenv("WHISPER_DEVICE", "auto"),
+            whisper_compute_type=os.getenv("WHISPER_COMPUTE_TYPE") or "auto",
         )
 
         print("\n--- 녹음 테스트 ---")
@@ -381,7 +478,7 @@ async def test_stt_service():
         if audio_np is not None:
             print(f"녹음된 오디오 데이터 길이: {len(audio_np)} 샘플")
             print("\n--- 변환 테스트 ---")
-            text = await asyncio.to_thread(stt.transcribe_audio, audio_np)
+            text = await stt.atranscribe(audio_np)
             print(f"\n변환된 텍스트 ({stt.provider}): '{text}'")
         else:
             print("녹음에 실패하여 변환 테스트를 건너뜁니다.")
@@ -1,5 +1,7 @@
 import json
 import os
+import re
+import shlex
 import subprocess
 from typing import Optional, Tuple
 
@@ -7,9 +9,30 @@ from mcp.server.fastmcp import FastMCP
 
 DEFAULT_COMMAND_TIMEOUT = 30
 
+# 명령어 어디에 있든 차단하는 위험 패턴
+_FORBIDDEN_SUBSTRINGS = (
+    "rm -rf /",
+    "mkfs",
+    ":(){:|:&};:",
+    "mv /",
+)
+# sudo로 시작하는 명령어와 위험 패턴을 한 번의 검색으로 검사하도록 미리 컴파일
+_FORBIDDEN_RE = re.compile(
+    r"\A\s*sudo(?:\s|\Z)|" + "|".join(map(re.escape, _FORBIDDEN_SUBSTRINGS))
+)
+
+# 하나라도 포함되면 셸 해석이 필요한 문자 (파이프, 리디렉션, 변수, 글롭, 따옴표 등)
+_SHELL_METACHARACTERS = frozenset("|&;<>()$`\\\"'*?[]{}#~=%!\n")
+
 mcp = FastMCP("terminal_executor")
 
 
+def _needs_shell(command: str) -> bool:
+    """셸 없이 인자 목록으로 바로 실행할 수 없는 명령어인지 확인합니다."""
+    # Windows의 명령어 해석 규칙은 shlex와 다르므로 항상 셸을 사용
+    return os.name != "posix" or not _SHELL_METACHARACTERS.isdisjoint(command)
+
+
 def _execute_local_command_sync(
     command: str, timeout: Optional[int] = None
 ) -> Tuple[Optional[str], Optional[str], int]:
@@ -20,18 +43,7 @@ def _execute_local_command_sync(
     effective_timeout = timeout if timeout > 0 else DEFAULT_COMMAND_TIMEOUT
     print(f"\n[로컬 명령어 실행 시도]: {command} (타임아웃: {effective_timeout}초)")
 
-    forbidden_keywords = [
-        "sudo",
-        "rm -rf /",
-        "mkfs",
-        ":(){:|:&};:",
-        "mv /",
-    ]
-
-    first_word = command.strip().split(" ")[0]
-    if first_word in forbidden_keywords or any(
-        keyword in command for keyword in forbidden_keywords[1:]
-    ):
+    if _FORBIDDEN_RE.search(command):
         print(f"[보안 경고]: 위험 가능성이 있는 명령어 패턴 감지: {command}")
         return (
             None,
@@ -39,16 +51,25 @@ def _execute_local_command_sync(
             -2,
         )
 
+    run_kwargs = dict(
+        capture_output=True,
+        text=True,
+        check=False,
+        timeout=effective_timeout,
+        cwd=os.getcwd(),
+    )
     try:
-        result = subprocess.run(
-            command,
-            shell=True,
-            capture_output=True,
-            text=True,
-            check=False,
-            timeout=effective_timeout,
-            cwd=os.getcwd(),
-        )
+        # 단순 명령어는 /bin/sh를 거치지 않고 직접 실행하여 셸 시작 비용을 줄임
+        argv = None if _needs_shell(command) else shlex.split(command)
+        if argv:
+            try:
+                result = subprocess.run(argv, shell=False, **run_kwargs)
+            except OSError:
+                # 셸 내장 명령어(cd, export 등)나 실행 권한이 없는 파일처럼 직접 실행할 수 없으면
+                # 셸로 다시 실행하여 셸과 같은 오류 메시지와 종료 코드(126/127)를 돌려줌
+                result = subprocess.run(command, shell=True, **run_kwargs)
+        else:
+            result = subprocess.run(command, shell=True, **run_kwargs)
         print("--- 실행 결과 ---")
         if result.stdout:
             print("[STDOUT]:")
@@ -0,0 +1,102 @@
+import collections
+import os
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+pytest.importorskip("PyQt6.QtWidgets")
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from PyQt6.QtCore import QObject, pyqtSignal  # noqa: E402
+from PyQt6.QtWidgets import QApplication  # noqa: E402
+
+from bongchun_agent.gui import BongchunAgentGUI  # noqa: E402
+from bongchun_agent.messages import MessageKind  # noqa: E402
+
+
+class _PromptManager:
+    available_prompts = [""]
+
+
+class _Controller(QObject):
+    response_ready = pyqtSignal()
+    attachments_changed = pyqtSignal(list)
+
+    def __init__(self):
+        super().__init__()
+        self.response_queue = collections.deque()
+
+    def post(self, kind, payload=""):
+        self.response_queue.append((kind, payload))
+        self.response_ready.emit()
+
+
+@pytest.fixture
+def app():
+    return QApplication.instance() or QApplication([])
+
+
+@pytest.fixture
+def window(app):
+    controller = _Controller()
+    window = BongchunAgentGUI(
+        client=None,
+        prompt_manager=_PromptManager(),
+        hotkey_manager=None,
+        app_controller=controller,
+    )
+    window.show()
+    _process_events(app)
+    yield window, controller
+    window.close()
+
+
+def _process_events(app, duration=0.1):
+    deadline = time.monotonic() + duration
+    while time.monotonic() < deadline:
+        app.processEvents()
+
+
+def test_hidden_window_keeps_message_order(app, window):
+    window, controller = window
+    window.hide()
+    _process_events(app)
+
+    controller.post(MessageKind.AI, "earlier reply")
+    controller.post(MessageKind.SHOW_RECORDING)
+    controller.post(MessageKind.BUTTONS_DISABLED)
+    _process_events(app)
+
+    # 제어 메시지는 숨겨진 동안에도 바로 처리되고, 그리는 메시지는 아무것도 그려지지 않음
+    assert not controller.response_queue
+    assert window.inputBar.isEnabled() is False
+    assert window.responseArea.toPlainText() == ""
+
+    window.show()
+    _process_events(app)
+
+    lines = [line for line in window.responseArea.toPlainText().splitlines() if line]
+    assert lines == [
+        "Gemini:",
+        "earlier reply",
+        "음성 녹음 중...",
+    ]
+
+
+def test_clear_chat_while_hidden_drops_deferred_messages(app, window):
+    window, controller = window
+    window.hide()
+    _process_events(app)
+
+    controller.post(MessageKind.STATUS, "stale status")
+    controller.post(MessageKind.CLEAR_CHAT)
+    _process_events(app)
+
+    window.show()
+    _process_events(app)
+
+    assert window.responseArea.toPlainText() == ""
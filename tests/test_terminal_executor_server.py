@@ -0,0 +1,50 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("mcp.server.fastmcp")
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src" / "mcp_server"))
+
+import terminal_executor_server as server  # noqa: E402
+
+pytestmark = pytest.mark.skipif(
+    os.name != "posix", reason="셸 없이 직접 실행하는 경로는 POSIX에서만 사용됨"
+)
+
+
+def _run_with_shell(command):
+    result = subprocess.run(
+        command, shell=True, capture_output=True, text=True, check=False
+    )
+    return result.stdout, result.stderr, result.returncode
+
+
+def _write_script(path, mode):
+    path.write_text("echo hello\n")
+    path.chmod(mode)
+    return path
+
+
+@pytest.mark.parametrize(
+    "make_target",
+    [
+        # 실행 권한이 없는 스크립트 (PermissionError -> 126)
+        lambda tmp_path: _write_script(tmp_path / "script.sh", mode=0o644),
+        # shebang 없는 실행 파일 (ENOEXEC, 셸은 스크립트로 실행함)
+        lambda tmp_path: _write_script(tmp_path / "no-shebang", mode=0o755),
+        # 디렉토리 경로 (PermissionError -> 126)
+        lambda tmp_path: tmp_path,
+        # 존재하지 않는 명령어 (FileNotFoundError -> 127)
+        lambda tmp_path: tmp_path / "missing-command",
+    ],
+    ids=["non-executable", "no-shebang", "directory", "missing"],
+)
+def test_direct_exec_failure_matches_shell(tmp_path, make_target):
+    command = str(make_target(tmp_path))
+    assert not server._needs_shell(command)
+
+    assert server._execute_local_command_sync(command, 5) == _run_with_shell(command)